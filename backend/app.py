@@ -1,18 +1,22 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
+import asyncio
 import hashlib
 import os
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import csv
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from blockchain import Blockchain
 from bloom import BloomFilterManager
+from scrubber import IntegrityScrubber
+from upload_sessions import UploadSessionManager, UploadSessionError, CHUNK_SIZE
 
 APP_TITLE = "Blockchain Memo Authenticator"
 APP_VERSION = "1.1.0"
@@ -21,15 +25,36 @@ UPLOADS_DIR = Path("uploads")
 ADMINS_FILE = DATA_DIR / "admins.json"
 BLOCKCHAIN_FILE = DATA_DIR / "blockchain.json"
 BLOOM_FILE = DATA_DIR / "memos.bloom"
+SCRUB_STATE_FILE = DATA_DIR / "scrub_state.json"
+# Staged under uploads/ so finished memos are renamed within one filesystem (data/ may be a separate mount)
+UPLOAD_SESSIONS_DIR = UPLOADS_DIR / ".sessions"
 
 # JWT settings (override via env vars in production)
 SECRET_KEY = os.getenv("JWT_SECRET", "dev-secret-change-me")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+# Integrity scrubber settings (SCRUB_MAX_BYTES_PER_SEC=0 disables the bandwidth cap)
+SCRUB_ENABLED = os.getenv("SCRUB_ENABLED", "1") == "1"
+SCRUB_INTERVAL_SECONDS = int(os.getenv("SCRUB_INTERVAL_SECONDS", "3600"))
+SCRUB_WORKERS = int(os.getenv("SCRUB_WORKERS", "2"))
+SCRUB_MAX_BYTES_PER_SEC = int(os.getenv("SCRUB_MAX_BYTES_PER_SEC", str(8 * 1024 * 1024)))
+
+# Resumable upload sessions idle for longer than this are discarded
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+
 auth_scheme = HTTPBearer(auto_error=True)
 
-app = FastAPI(title=APP_TITLE, version=APP_VERSION)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCRUB_ENABLED:
+        scrubber.start()
+    yield
+    # stop() joins the scrubber thread; keep that off the event loop
+    await asyncio.to_thread(scrubber.stop, 5)
+
+
+app = FastAPI(title=APP_TITLE, version=APP_VERSION, lifespan=lifespan)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -47,6 +72,18 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 # Initialize blockchain and bloom filter with persistence
 blockchain = Blockchain(storage_path=str(BLOCKCHAIN_FILE))
 bloom_filter = BloomFilterManager(storage_path=str(BLOOM_FILE))
+scrubber = IntegrityScrubber(
+    blockchain,
+    uploads_dir=str(UPLOADS_DIR),
+    storage_path=str(SCRUB_STATE_FILE),
+    workers=SCRUB_WORKERS,
+    max_bytes_per_sec=SCRUB_MAX_BYTES_PER_SEC,
+    interval_seconds=SCRUB_INTERVAL_SECONDS,
+)
+upload_sessions = UploadSessionManager(
+    storage_dir=str(UPLOAD_SESSIONS_DIR),
+    ttl_seconds=UPLOAD_SESSION_TTL_HOURS * 3600,
+)
 
 # Bootstrap admins file if missing
 if not ADMINS_FILE.exists():
@@ -110,6 +147,74 @@ def compute_file_hash(file_content: bytes) -> str:
     return hashlib.sha256(file_content).hexdigest()
 
 
+def compute_path_hash(path: Path) -> str:
+    """Compute SHA-256 hash of a file on disk without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def validate_sha256(value: str) -> str:
+    """Normalize a client-declared SHA-256 hex digest or reject it with 400"""
+    normalized = (value or "").strip().lower()
+    if len(normalized) != 64 or not all(c in "0123456789abcdef" for c in normalized):
+        raise HTTPException(status_code=400, detail="hash must be a 64-char hex SHA-256")
+    return normalized
+
+
+def is_allowed_content_type(content_type: Optional[str]) -> bool:
+    return bool(content_type) and (content_type.startswith("application/pdf") or content_type.startswith("image/"))
+
+
+def find_existing_memo(file_hash: str) -> Optional[int]:
+    """Block index of a memo already on the chain; the bloom filter skips the chain scan for new hashes"""
+    if not bloom_filter.might_exist(file_hash):
+        return None
+    return blockchain.find_hash(file_hash)
+
+
+def exists_response(file_hash: str, block_index: int) -> JSONResponse:
+    return JSONResponse({
+        "status": "exists",
+        "message": "File already exists in blockchain",
+        "hash": file_hash,
+        "block_index": block_index,
+    })
+
+
+def record_memo(
+    file_hash: str,
+    original_filename: Optional[str],
+    stored_filename: str,
+    student_id: str,
+    student_name: str,
+    college: str,
+    verified: Optional[bool],
+    uploader: str,
+) -> int:
+    """Add a stored memo to the bloom filter and chain; returns the new block index"""
+    bloom_filter.add(file_hash)
+    tx = {
+        "hash": file_hash,
+        "student_id": student_id,
+        "student_name": student_name,
+        "verified": bool(verified) if verified is not None else True,
+        "college": college,
+        "tx_timestamp": datetime.now().isoformat(),
+        "original_filename": original_filename,
+        "stored_filename": stored_filename,
+        "uploader": uploader,
+    }
+    return blockchain.add_transaction(tx)
+
+
+def stored_filename_for(file_hash: str, original_filename: Optional[str]) -> str:
+    file_extension = os.path.splitext(original_filename or "")[1] or ".bin"
+    return f"{file_hash}{file_extension}"
+
+
 def load_students_data() -> Dict[str, Dict[str, Any]]:
     """Load students data from CSV file"""
     students: Dict[str, Dict[str, Any]] = {}
@@ -173,7 +278,7 @@ async def upload_memo(
     """Upload a PDF/image memo, compute hash, update bloom + blockchain, save file as <hash>.<ext>."""
     try:
         # Validate file type
-        if not file.content_type or not (file.content_type.startswith("application/pdf") or file.content_type.startswith("image/")):
+        if not is_allowed_content_type(file.content_type):
             raise HTTPException(status_code=400, detail="Only PDF and image files are allowed")
 
         # Read file content
@@ -185,41 +290,21 @@ async def upload_memo(
         file_hash = compute_file_hash(content)
 
         # Duplicate check via bloom + chain
-        exists_bloom = bloom_filter.might_exist(file_hash)
-        block_index = blockchain.find_hash(file_hash) if exists_bloom else None
+        block_index = find_existing_memo(file_hash)
         if block_index is not None:
-            return JSONResponse({
-                "status": "exists",
-                "message": "File already exists in blockchain",
-                "hash": file_hash,
-                "block_index": block_index,
-            })
+            return exists_response(file_hash, block_index)
 
         # Persist file
-        file_extension = os.path.splitext(file.filename or "")[1] or ".bin"
-        stored_filename = f"{file_hash}{file_extension}"
+        stored_filename = stored_filename_for(file_hash, file.filename)
         file_path = UPLOADS_DIR / stored_filename
         with open(file_path, "wb") as f:
             f.write(content)
 
-        # Update bloom
-        bloom_filter.add(file_hash)
-
-        # Build transaction
-        tx = {
-            "hash": file_hash,
-            "student_id": student_id,
-            "student_name": student_name,
-            "verified": bool(verified) if verified is not None else True,
-            "college": college,
-            "tx_timestamp": datetime.now().isoformat(),
-            "original_filename": file.filename,
-            "stored_filename": stored_filename,
-            "uploader": current_admin,
-        }
-
-        # Add block
-        created_index = blockchain.add_transaction(tx)
+        # Update bloom + add block
+        created_index = record_memo(
+            file_hash, file.filename, stored_filename,
+            student_id, student_name, college, verified, current_admin,
+        )
 
         return JSONResponse({
             "status": "success",
@@ -235,6 +320,173 @@ async def upload_memo(
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+# --------------- Protected: Hash-first & Resumable Upload ---------------
+
+@app.post("/upload_memo/check")
+async def check_memo(
+    current_admin: str = Depends(get_current_admin),
+    hash: str = Form(...),
+    size: int = Form(...),
+):
+    """Phase 1: answer from the bloom filter + chain before any file bytes are sent.
+    Returns status "exists" with the block index, or "unknown" if the client should open an upload session."""
+    file_hash = validate_sha256(hash)
+    if size <= 0:
+        raise HTTPException(status_code=400, detail="size must be positive")
+    block_index = find_existing_memo(file_hash)
+    if block_index is not None:
+        return exists_response(file_hash, block_index)
+    return JSONResponse({"status": "unknown", "hash": file_hash})
+
+
+def session_response(session: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "status": "in_progress",
+        "session_id": session["session_id"],
+        "hash": session["hash"],
+        "size": session["size"],
+        "received_bytes": session["received_bytes"],
+        "filename": session.get("filename"),
+        "student_id": session.get("student_id"),
+        "student_name": session.get("student_name"),
+        "college": session.get("college"),
+    }
+
+
+def get_owned_session(session_id: str, current_admin: str) -> Dict[str, Any]:
+    session = upload_sessions.get(session_id)
+    if not session or session.get("uploader") != current_admin:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+
+@app.post("/upload_sessions")
+async def create_upload_session(
+    current_admin: str = Depends(get_current_admin),
+    hash: str = Form(...),
+    size: int = Form(...),
+    filename: str = Form(...),
+    content_type: str = Form(...),
+    student_id: str = Form(...),
+    student_name: str = Form(...),
+    college: str = Form(...),
+    verified: Optional[bool] = Form(True),
+):
+    """Phase 2: open a resumable chunked upload for a memo the chain does not know yet."""
+    file_hash = validate_sha256(hash)
+    if size <= 0:
+        raise HTTPException(status_code=400, detail="size must be positive")
+    if not is_allowed_content_type(content_type):
+        raise HTTPException(status_code=400, detail="Only PDF and image files are allowed")
+    block_index = find_existing_memo(file_hash)
+    if block_index is not None:
+        return exists_response(file_hash, block_index)
+
+    session = upload_sessions.create(file_hash, size, {
+        "filename": filename,
+        "content_type": content_type,
+        "student_id": student_id,
+        "student_name": student_name,
+        "college": college,
+        "verified": bool(verified) if verified is not None else True,
+        "uploader": current_admin,
+    })
+    return JSONResponse(session_response(session))
+
+
+@app.get("/upload_sessions/{session_id}")
+async def get_upload_session(session_id: str, current_admin: str = Depends(get_current_admin)):
+    """Report how many bytes the server holds so an interrupted client can resume from there."""
+    return JSONResponse(session_response(get_owned_session(session_id, current_admin)))
+
+
+def finalize_upload_session(session: Dict[str, Any], current_admin: str) -> JSONResponse:
+    """Verify a fully received session and commit it to uploads/ and the chain.
+    Safe to call again after an interruption at any step."""
+    session_id = session["session_id"]
+    file_hash = session["hash"]
+
+    # Already committed (e.g. crashed after record_memo, before discard)
+    block_index = find_existing_memo(file_hash)
+    if block_index is not None:
+        upload_sessions.discard(session_id)
+        return exists_response(file_hash, block_index)
+
+    stored_filename = stored_filename_for(file_hash, session["filename"])
+    stored_path = UPLOADS_DIR / stored_filename
+    part_path = upload_sessions.part_path(session_id)
+    if os.path.exists(part_path):
+        # Verify against the declared hash before touching the chain
+        if upload_sessions.digest(session) != file_hash:
+            upload_sessions.discard(session_id)
+            raise HTTPException(status_code=400, detail="Uploaded content does not match declared hash")
+        os.replace(part_path, stored_path)
+    elif not (stored_path.exists() and compute_path_hash(stored_path) == file_hash):
+        # Neither the staged bytes nor a moved copy survived
+        upload_sessions.discard(session_id)
+        raise HTTPException(status_code=404, detail="Upload data not found; start a new session")
+
+    created_index = record_memo(
+        file_hash, session["filename"], stored_filename,
+        session["student_id"], session["student_name"], session["college"],
+        session["verified"], current_admin,
+    )
+    upload_sessions.discard(session_id)
+
+    return JSONResponse({
+        "status": "success",
+        "message": "File uploaded and added to blockchain",
+        "hash": file_hash,
+        "block_index": created_index,
+        "filename": stored_filename,
+    })
+
+
+@app.put("/upload_sessions/{session_id}")
+async def upload_chunk(
+    session_id: str,
+    current_admin: str = Depends(get_current_admin),
+    offset: int = Form(...),
+    chunk: Optional[UploadFile] = File(None),
+    chunk_sha256: Optional[str] = Form(None),
+):
+    """Append one chunk at `offset`. The final chunk is checked against the declared hash
+    before the memo is stored and added to the chain; a mismatch discards the session.
+    Once every byte has arrived, an empty PUT at `offset == size` retries finalization,
+    so a crash between the last chunk and the chain update does not lose the upload."""
+    try:
+        data = await chunk.read() if chunk else b""
+        session = get_owned_session(session_id, current_admin)
+        if chunk_sha256 and compute_file_hash(data) != validate_sha256(chunk_sha256):
+            raise HTTPException(status_code=400, detail="Chunk does not match chunk_sha256")
+
+        complete = session["received_bytes"] == session["size"]
+        if not (complete and not data and offset == session["size"]):
+            try:
+                session = upload_sessions.append(session, offset, data)
+            except UploadSessionError as e:
+                return JSONResponse(
+                    status_code=e.status_code,
+                    content={"detail": e.detail, "received_bytes": e.received_bytes},
+                )
+        if session["received_bytes"] < session["size"]:
+            return JSONResponse(session_response(session))
+
+        return finalize_upload_session(session, current_admin)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chunk upload failed: {str(e)}")
+
+
+@app.delete("/upload_sessions/{session_id}")
+async def cancel_upload_session(session_id: str, current_admin: str = Depends(get_current_admin)):
+    get_owned_session(session_id, current_admin)
+    upload_sessions.discard(session_id)
+    return {"status": "cancelled"}
+
+
 @app.post("/verify")
 async def verify(
     current_admin: str = Depends(get_current_admin),
@@ -497,6 +749,30 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of integrity scrubber gauges"""
+    lines = [f"{name} {value}" for name, value in scrubber.metrics().items()]
+    return PlainTextResponse("\n".join(lines) + "\n")
+
+
+# --------------- Protected: Admin ---------------
+
+@app.get("/admin/scrub")
+async def scrub_status(current_admin: str = Depends(get_current_admin)):
+    """Integrity scrubber progress and the missing/mismatched/orphaned files from the last pass."""
+    return JSONResponse(scrubber.status())
+
+
+@app.post("/admin/scrub")
+async def scrub_now(current_admin: str = Depends(get_current_admin)):
+    """Start a scrub pass now instead of waiting for the next interval."""
+    if not SCRUB_ENABLED:
+        raise HTTPException(status_code=409, detail="Integrity scrubber is disabled")
+    scrubber.trigger()
+    return JSONResponse({"status": "triggered", "running": scrubber.status()["running"]})
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""Benchmark suite for the blockchain, bloom filter and HTTP hot paths.
+
+Run from the backend directory, e.g. ``python -m benchmarks micro --sizes 10000``.
+"""
@@ -0,0 +1,93 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# Make the flat backend modules (blockchain, bloom, app) importable from any cwd
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.datagen import chain_hashes, generate_chain, write_bloom, write_chain  # noqa: E402
+from benchmarks.stats import environment  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _emit(report: Dict[str, Any], output: str) -> None:
+    text = json.dumps(report, indent=2)
+    if output == "-":
+        print(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Wrote {output}", file=sys.stderr)
+
+
+def main() -> None:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--seed", type=int, default=0, help="seed for the synthetic data generator")
+    common.add_argument("--output", "-o", default="-", help="write the JSON report here (default: stdout)")
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Memo authenticator benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    micro = sub.add_parser("micro", parents=[common], help="micro-benchmark Blockchain and BloomFilterManager")
+    micro.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="chain sizes in memos")
+    micro.add_argument("--repeat", type=int, default=5,
+                       help="iterations for whole-chain operations (validate_chain, _load, add_transaction, bloom add)")
+    micro.add_argument("--lookups", type=int, default=200, help="iterations for find_hash and might_exist")
+
+    load = sub.add_parser("load", parents=[common], help="in-process ASGI load test of /upload_memo and /verify")
+    load.add_argument("--chain-size", type=int, default=10_000, help="memos pre-seeded on the chain")
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    load.add_argument("--upload-bytes", type=int, default=64 * 1024, help="size of each new upload")
+    load.add_argument("--duplicate-ratio", type=float, default=0.5,
+                      help="share of uploads that re-send a memo already on the chain")
+    load.add_argument("--hit-ratio", type=float, default=0.5, help="share of /verify lookups for known hashes")
+
+    generate = sub.add_parser("generate", help="write a synthetic blockchain.json and matching memos.bloom")
+    generate.add_argument("--seed", type=int, default=0, help="seed for the synthetic data generator")
+    generate.add_argument("--size", type=int, required=True, help="number of memos")
+    generate.add_argument("path", help="destination file, e.g. /tmp/memo-bench/blockchain.json")
+    generate.add_argument("--force", action="store_true",
+                          help="overwrite an existing blockchain.json/memos.bloom (e.g. the live data/ directory)")
+
+    args = parser.parse_args()
+    report: Dict[str, Any] = {"environment": environment(), "command": args.command, "seed": args.seed}
+
+    if args.command == "micro":
+        from benchmarks.micro import run_micro
+        report.update({"repeat": args.repeat, "lookups": args.lookups})
+        report["results"] = run_micro(args.sizes, args.repeat, args.lookups, args.seed)
+    elif args.command == "load":
+        from benchmarks.load import run_load
+        report["results"] = run_load(
+            chain_size=args.chain_size,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            seed=args.seed,
+            upload_bytes=args.upload_bytes,
+            duplicate_ratio=args.duplicate_ratio,
+            hit_ratio=args.hit_ratio,
+        )
+    else:
+        chain_path = Path(args.path).resolve()
+        bloom_path = chain_path.parent / "memos.bloom"
+        existing = [str(p) for p in (chain_path, bloom_path) if p.exists()]
+        if existing and not args.force:
+            parser.error(f"refusing to overwrite {', '.join(existing)}; pass --force to replace them")
+        blockchain = generate_chain(args.size, args.seed)
+        write_chain(blockchain, str(chain_path))
+        # The app only scans the chain for hashes the bloom filter knows, so keep them in sync
+        write_bloom(chain_hashes(blockchain), str(bloom_path))
+        print(f"Wrote {args.size} memos to {args.path} and {bloom_path}", file=sys.stderr)
+        return
+
+    _emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
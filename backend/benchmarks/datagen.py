@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from blockchain import Block, Blockchain
+
+# Weighted roughly like a mid-size university: a few large colleges dominate.
+COLLEGES: List[Tuple[str, float]] = [
+    ("Engineering", 0.27),
+    ("Computer Science", 0.21),
+    ("Business", 0.17),
+    ("Medicine", 0.14),
+    ("Arts", 0.09),
+    ("Law", 0.07),
+    ("Pharmacy", 0.05),
+]
+
+FIRST_NAMES = [
+    "Ahmed", "Fatima", "Omar", "Layla", "Youssef", "Nour", "Karim", "Salma",
+    "Hassan", "Dina", "Tarek", "Mona", "Amr", "Rana", "Mahmoud", "Sara",
+    "Mostafa", "Aya", "Khaled", "Hana", "Ali", "Yara", "Ibrahim", "Mariam",
+]
+LAST_NAMES = [
+    "Hassan", "Al-Zahra", "Khaled", "Mahmoud", "Ali", "Abdel Rahman", "Mostafa",
+    "Ibrahim", "Mohamed", "Farouk", "Saeed", "Adel", "Gamal", "Nabil", "Essam",
+    "Fathy", "Shawky", "Salem", "Youssef", "Kamal",
+]
+
+EXTENSIONS = [(".pdf", 0.8), (".jpg", 0.12), (".png", 0.08)]
+
+UPLOADERS = ["registrar", "admissions", "admin"]
+
+# Share of memos issued to a student who already has one (re-issues, corrections).
+REISSUE_RATE = 0.08
+
+
+def _weighted(rng: random.Random, choices: List[Tuple[str, float]]) -> str:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def iter_transactions(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield `count` memo transactions shaped like the ones /upload_memo records"""
+    rng = random.Random(seed)
+    students: List[Tuple[str, str, str]] = []
+    start = datetime(2023, 9, 1)
+    for i in range(count):
+        if students and rng.random() < REISSUE_RATE:
+            student_id, student_name, college = rng.choice(students)
+        else:
+            student_id = str(100000 + len(students))
+            student_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            college = _weighted(rng, COLLEGES)
+            students.append((student_id, student_name, college))
+
+        file_hash = hashlib.sha256(f"memo-{seed}-{i}".encode("utf-8")).hexdigest()
+        extension = _weighted(rng, EXTENSIONS)
+        yield {
+            "hash": file_hash,
+            "student_id": student_id,
+            "student_name": student_name,
+            "verified": True,
+            "college": college,
+            "tx_timestamp": (start + timedelta(seconds=30 * i)).isoformat(),
+            "original_filename": f"memo_{student_id}{extension}",
+            "stored_filename": f"{file_hash}{extension}",
+            "uploader": rng.choice(UPLOADERS),
+        }
+
+
+def generate_chain(count: int, seed: int = 0) -> Blockchain:
+    """Build an in-memory Blockchain holding `count` synthetic memos (plus genesis)"""
+    blockchain = Blockchain(storage_path=None)
+    start = datetime(2023, 9, 1)
+    # Pin the genesis timestamp so block hashes are identical across runs
+    blockchain.chain = [Block(0, [], "0", timestamp=start.isoformat())]
+    for i, tx in enumerate(iter_transactions(count, seed)):
+        block = Block(
+            index=len(blockchain.chain),
+            transactions=[tx],
+            previous_hash=blockchain.chain[-1].block_hash,
+            timestamp=(start + timedelta(seconds=30 * i, milliseconds=7)).isoformat(),
+        )
+        blockchain.chain.append(block)
+    return blockchain
+
+
+def write_chain(blockchain: Blockchain, path: str) -> None:
+    """Persist a chain in the same format as Blockchain._save"""
+    blockchain.storage_path = path
+    blockchain._save()
+
+
+def write_bloom(hashes: List[str], path: str, size: int = 10000, hash_count: int = 3) -> None:
+    """Persist a bloom filter file in the same format as BloomFilterManager._save"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"size": size, "hash_count": hash_count, "added_items": hashes}, f)
+
+
+def chain_hashes(blockchain: Blockchain, limit: Optional[int] = None) -> List[str]:
+    """Return memo hashes in chain order, skipping the genesis block"""
+    hashes: List[str] = []
+    for block in blockchain.chain:
+        for tx in block.transactions:
+            hashes.append(tx["hash"])
+            if limit is not None and len(hashes) >= limit:
+                return hashes
+    return hashes
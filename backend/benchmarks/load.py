@@ -0,0 +1,148 @@
+import asyncio
+import importlib
+import os
+import random
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.datagen import chain_hashes, generate_chain, write_bloom, write_chain
+from benchmarks.stats import peak_rss_mb, summarize
+
+BENCH_USER = "bench-admin"
+BENCH_PASSWORD = "bench-password"
+
+
+async def _drive(
+    send: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Issue `requests` calls through `concurrency` workers and summarize latencies"""
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    samples: List[float] = []
+    status_counts: Dict[str, int] = {}
+
+    async def worker() -> None:
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            resp = await send(i)
+            samples.append(time.perf_counter() - start)
+            key = str(resp.status_code)
+            status_counts[key] = status_counts.get(key, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result.update({
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "status_counts": status_counts,
+        "peak_rss_mb": peak_rss_mb(),
+    })
+    return result
+
+
+async def _login(client: httpx.AsyncClient) -> Dict[str, str]:
+    await client.post("/auth/register", data={"username": BENCH_USER, "password": BENCH_PASSWORD})
+    resp = await client.post("/auth/login", data={"username": BENCH_USER, "password": BENCH_PASSWORD})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def _run_scenarios(
+    app: Any,
+    known: List[str],
+    seed: int,
+    requests: int,
+    concurrency: int,
+    upload_bytes: int,
+    duplicate_ratio: float,
+    hit_ratio: float,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = await _login(client)
+
+        # Duplicates re-send the exact bytes behind a synthetic chain hash, so they hit the "exists" path
+        uploads: List[bytes] = []
+        for i in range(requests):
+            if known and rng.random() < duplicate_ratio:
+                uploads.append(f"memo-{seed}-{rng.randrange(len(known))}".encode("utf-8"))
+            else:
+                uploads.append(b"%PDF-1.4\n" + rng.randbytes(max(upload_bytes - 9, 1)))
+
+        async def upload(i: int) -> httpx.Response:
+            return await client.post(
+                "/upload_memo",
+                headers=headers,
+                files={"file": (f"memo_{i}.pdf", uploads[i], "application/pdf")},
+                data={"student_id": str(900000 + i), "student_name": "Bench Student", "college": "Engineering"},
+            )
+
+        lookups = [
+            rng.choice(known) if known and rng.random() < hit_ratio else f"{rng.getrandbits(256):064x}"
+            for _ in range(requests)
+        ]
+
+        async def verify(i: int) -> httpx.Response:
+            return await client.post("/verify", headers=headers, data={"manual_hash": lookups[i]})
+
+        return {
+            "verify": await _drive(verify, requests, concurrency),
+            "upload_memo": await _drive(upload, requests, concurrency),
+        }
+
+
+def run_load(
+    chain_size: int,
+    concurrency: int,
+    requests: int,
+    seed: int,
+    upload_bytes: int = 64 * 1024,
+    duplicate_ratio: float = 0.5,
+    hit_ratio: float = 0.5,
+) -> Dict[str, Any]:
+    """Load-test /verify and /upload_memo in-process against a pre-seeded chain.
+
+    The app resolves data/ and uploads/ relative to the working directory, so it is
+    imported from inside a throwaway directory seeded with a synthetic chain and bloom file.
+    """
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="memo-load-") as workdir:
+        blockchain = generate_chain(chain_size, seed)
+        known = chain_hashes(blockchain)
+        write_chain(blockchain, os.path.join(workdir, "data", "blockchain.json"))
+        write_bloom(known, os.path.join(workdir, "data", "memos.bloom"))
+        del blockchain
+
+        os.chdir(workdir)
+        try:
+            app_module = importlib.import_module("app")
+            results = asyncio.run(_run_scenarios(
+                app_module.app, known, seed, requests, concurrency,
+                upload_bytes, duplicate_ratio, hit_ratio,
+            ))
+        finally:
+            os.chdir(original_cwd)
+
+    return {
+        "chain_size": chain_size,
+        "requests": requests,
+        "upload_bytes": upload_bytes,
+        "duplicate_ratio": duplicate_ratio,
+        "hit_ratio": hit_ratio,
+        "scenarios": results,
+    }
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from bloom import BloomFilterManager
+from benchmarks.datagen import chain_hashes, generate_chain, iter_transactions, write_chain
+from benchmarks.stats import peak_rss_mb, summarize, time_calls
+
+
+def _missing_hashes(count: int, seed: int) -> List[str]:
+    return [hashlib.sha256(f"absent-{seed}-{i}".encode("utf-8")).hexdigest() for i in range(count)]
+
+
+def bench_chain(size: int, repeat: int, lookups: int, seed: int, workdir: str) -> Dict[str, Any]:
+    """Time the Blockchain hot paths against a synthetic chain of `size` memos"""
+    rng = random.Random(seed)
+    results: Dict[str, Any] = {}
+
+    start = time.perf_counter()
+    blockchain = generate_chain(size, seed)
+    results["generate_s"] = time.perf_counter() - start
+
+    hashes = chain_hashes(blockchain)
+    hits = [rng.choice(hashes) for _ in range(lookups)]
+    misses = _missing_hashes(lookups, seed)
+    del hashes
+
+    results["find_hash_hit"] = summarize(time_calls(lambda i: blockchain.find_hash(hits[i]), lookups))
+    results["find_hash_miss"] = summarize(time_calls(lambda i: blockchain.find_hash(misses[i]), lookups))
+    results["validate_chain"] = summarize(time_calls(lambda i: blockchain.validate_chain(), repeat))
+
+    path = os.path.join(workdir, f"blockchain-{size}.json")
+    write_chain(blockchain, path)
+    results["file_bytes"] = os.path.getsize(path)
+    results["load"] = summarize(time_calls(lambda i: blockchain._load(), repeat))
+
+    # add_transaction persists the whole chain on every call, as in production
+    new_txs = list(iter_transactions(repeat, seed + 1))
+    results["add_transaction"] = summarize(time_calls(lambda i: blockchain.add_transaction(new_txs[i]), repeat))
+
+    del blockchain
+    os.remove(path)
+    return results
+
+
+def bench_bloom(size: int, repeat: int, lookups: int, seed: int, workdir: str) -> Dict[str, Any]:
+    """Time BloomFilterManager add/might_exist with `size` items already present"""
+    rng = random.Random(seed)
+    results: Dict[str, Any] = {}
+
+    hashes = [tx["hash"] for tx in iter_transactions(size, seed)]
+    bloom = BloomFilterManager(storage_path=None)
+    start = time.perf_counter()
+    for h in hashes:
+        bloom.add(h)
+    results["populate_s"] = time.perf_counter() - start
+
+    hits = [rng.choice(hashes) for _ in range(lookups)]
+    misses = _missing_hashes(lookups, seed)
+    del hashes
+
+    results["might_exist_hit"] = summarize(time_calls(lambda i: bloom.might_exist(hits[i]), lookups))
+    results["might_exist_miss"] = summarize(time_calls(lambda i: bloom.might_exist(misses[i]), lookups))
+
+    # add rewrites the bloom file on every call, as in production
+    bloom.storage_path = os.path.join(workdir, f"memos-{size}.bloom")
+    new_items = _missing_hashes(repeat, seed + 1)
+    results["add"] = summarize(time_calls(lambda i: bloom.add(new_items[i]), repeat))
+    results["stats"] = bloom.get_stats()
+
+    os.remove(bloom.storage_path)
+    return results
+
+
+def run_micro(sizes: List[int], repeat: int, lookups: int, seed: int) -> List[Dict[str, Any]]:
+    """Run chain and bloom micro-benchmarks for every chain size"""
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="memo-bench-") as workdir:
+        for size in sizes:
+            runs.append({
+                "size": size,
+                "blockchain": bench_chain(size, repeat, lookups, seed, workdir),
+                "bloom": bench_bloom(size, repeat, lookups, seed, workdir),
+                "peak_rss_mb": peak_rss_mb(),
+            })
+    return runs
@@ -0,0 +1,61 @@
+import math
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0..100)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Latency summary in milliseconds for a list of durations in seconds"""
+    total = sum(samples)
+    return {
+        "count": len(samples),
+        "min_ms": min(samples) * 1000 if samples else 0.0,
+        "mean_ms": (total / len(samples)) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000 if samples else 0.0,
+        "ops_per_sec": len(samples) / total if total else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[int], Any], repeat: int) -> List[float]:
+    """Call fn(i) `repeat` times and return each call's wall time in seconds"""
+    samples: List[float] = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def environment() -> Dict[str, Any]:
+    """Host details recorded alongside each run so results can be compared"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from blockchain import Blockchain
+
+CHUNK_SIZE = 1024 * 1024
+
+# Non-ok results of a file check, each kept as a list of findings per pass
+FINDING_KINDS = ("missing", "mismatched", "unreadable")
+
+
+class RateLimiter:
+    """Token bucket shared by scrubber workers to cap disk read bandwidth"""
+
+    def __init__(self, bytes_per_sec: int):
+        self.bytes_per_sec = bytes_per_sec
+        self._allowance = float(bytes_per_sec)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int):
+        """Block until `nbytes` may be read. A rate of 0 or less means unlimited."""
+        if self.bytes_per_sec <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(
+                float(self.bytes_per_sec),
+                self._allowance + (now - self._last) * self.bytes_per_sec,
+            )
+            self._last = now
+            self._allowance -= nbytes
+            wait = -self._allowance / self.bytes_per_sec if self._allowance < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class IntegrityScrubber:
+    """Background re-hash of stored memo files against the chain, with checkpointing.
+
+    Each pass walks blocks in order, re-hashes every transaction's stored file in a
+    thread pool and records missing, mismatched or unreadable files. After every batch
+    the offset and counters are checkpointed and new findings are appended to a JSONL
+    file, so a restart resumes the pass instead of starting over. At the end of a pass,
+    files in the uploads directory not referenced by any transaction are reported as
+    orphaned and the full report is written once.
+    """
+
+    def __init__(
+        self,
+        blockchain: Blockchain,
+        uploads_dir: str,
+        storage_path: Optional[str] = None,
+        workers: int = 2,
+        max_bytes_per_sec: int = 0,
+        interval_seconds: int = 3600,
+        batch_size: int = 64,
+    ):
+        self.blockchain = blockchain
+        self.uploads_dir = uploads_dir
+        self.storage_path = storage_path
+        base = os.path.splitext(storage_path)[0] if storage_path else None
+        self.findings_path = f"{base}.findings.jsonl" if base else None
+        self.report_path = f"{base}.last.json" if base else None
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(max_bytes_per_sec)
+        self.interval_seconds = interval_seconds
+        self.batch_size = max(1, batch_size)
+        self.running = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.current = self._new_pass()
+        self.last_completed: Optional[Dict[str, Any]] = None
+        if self.storage_path and os.path.exists(self.storage_path):
+            self._load()
+
+    @staticmethod
+    def _new_pass() -> Dict[str, Any]:
+        return {
+            "started_at": None,
+            "next_block": 0,
+            "files_checked": 0,
+            "bytes_hashed": 0,
+            **{kind: [] for kind in FINDING_KINDS},
+        }
+
+    # --------------- Lifecycle ---------------
+
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_forever, name="integrity-scrubber", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the background thread to stop after its current batch"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def trigger(self):
+        """Start the next pass now instead of waiting for the interval"""
+        self._wake.set()
+
+    def _initial_delay(self) -> float:
+        """Seconds left of the interval since the last completed pass, so restarts
+        (e.g. uvicorn --reload) don't kick off a fresh full pass every time"""
+        with self._lock:
+            if self.current["next_block"] or not self.last_completed:
+                return 0.0
+            completed_at = self.last_completed.get("completed_at")
+        if not completed_at:
+            return 0.0
+        elapsed = time.time() - datetime.fromisoformat(completed_at).timestamp()
+        return max(0.0, self.interval_seconds - elapsed)
+
+    def _run_forever(self):
+        delay = self._initial_delay()
+        if delay:
+            self._wake.wait(delay)
+            self._wake.clear()
+        while not self._stop.is_set():
+            try:
+                self.run_pass()
+            except Exception as e:
+                print(f"Integrity scrub failed: {e}")
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+
+    # --------------- Scrubbing ---------------
+
+    def _hash_file(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.limiter.consume(len(chunk))
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _check(self, block_index: int, tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Check one transaction's stored file; returns a finding with a `result` key"""
+        expected = tx.get("hash")
+        stored_filename = tx.get("stored_filename")
+        finding = {"block_index": block_index, "hash": expected, "stored_filename": stored_filename}
+        if not stored_filename:
+            return {**finding, "result": "missing", "reason": "stored_filename not recorded"}
+        path = os.path.join(self.uploads_dir, stored_filename)
+        try:
+            size = os.path.getsize(path)
+            actual = self._hash_file(path)
+        except FileNotFoundError:
+            return {**finding, "result": "missing", "reason": "file not found"}
+        except OSError as e:
+            # Permission errors, directories, failing disks: report, don't abort the pass
+            return {**finding, "result": "unreadable", "reason": str(e)}
+        if actual != expected:
+            return {**finding, "result": "mismatched", "actual_hash": actual, "size": size}
+        return {**finding, "result": "ok", "size": size}
+
+    def run_pass(self):
+        """Run (or resume) one full pass over the chain"""
+        with self._lock:
+            self.running = True
+            if not self.current["started_at"]:
+                self.current["started_at"] = datetime.now().isoformat()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scrub") as pool:
+                while not self._stop.is_set():
+                    start = self.current["next_block"]
+                    end = min(start + self.batch_size, len(self.blockchain.chain))
+                    if start >= end:
+                        break
+                    futures = [
+                        pool.submit(self._check, i, tx)
+                        for i in range(start, end)
+                        for tx in self.blockchain.chain[i].transactions
+                    ]
+                    findings = [f.result() for f in futures]
+                    new_findings: List[Dict[str, Any]] = []
+                    with self._lock:
+                        for finding in findings:
+                            result = finding.pop("result")
+                            if result in ("ok", "mismatched"):
+                                self.current["files_checked"] += 1
+                                self.current["bytes_hashed"] += finding["size"]
+                            if result != "ok":
+                                self.current[result].append(finding)
+                                new_findings.append({**finding, "result": result})
+                        self.current["next_block"] = end
+                    self._append_findings(new_findings)
+                    self._save_checkpoint()
+
+            if self._stop.is_set():
+                return
+            orphaned = self._find_orphans()
+            with self._lock:
+                self.last_completed = {
+                    **self.current,
+                    "completed_at": datetime.now().isoformat(),
+                    "orphaned": orphaned,
+                }
+                self.current = self._new_pass()
+            self._save_report()
+            self._save_checkpoint()
+            self._clear_findings()
+        finally:
+            with self._lock:
+                self.running = False
+
+    def _find_orphans(self) -> List[Dict[str, Any]]:
+        """Files in the uploads directory that no transaction references"""
+        referenced = {
+            tx.get("stored_filename")
+            for block in list(self.blockchain.chain)
+            for tx in block.transactions
+        }
+        started = datetime.fromisoformat(self.current["started_at"]).timestamp()
+        orphaned: List[Dict[str, Any]] = []
+        if not os.path.isdir(self.uploads_dir):
+            return orphaned
+        for entry in os.scandir(self.uploads_dir):
+            if not entry.is_file() or entry.name in referenced:
+                continue
+            stat = entry.stat()
+            # Skip files written during this pass; their block may not be appended yet
+            if stat.st_mtime >= started:
+                continue
+            orphaned.append({"stored_filename": entry.name, "size": stat.st_size})
+        return orphaned
+
+    # --------------- Reporting ---------------
+
+    def status(self) -> Dict[str, Any]:
+        """Current progress plus the results of the last completed pass"""
+        with self._lock:
+            return {
+                "running": self.running,
+                "workers": self.workers,
+                "max_bytes_per_sec": self.limiter.bytes_per_sec,
+                "interval_seconds": self.interval_seconds,
+                "current": {**self.current, "total_blocks": len(self.blockchain.chain)},
+                "last_completed": self.last_completed,
+            }
+
+    def metrics(self) -> Dict[str, float]:
+        """Flat gauges suitable for a Prometheus text endpoint"""
+        with self._lock:
+            last = self.last_completed or {}
+            completed_at = last.get("completed_at")
+            return {
+                "memo_scrub_running": 1 if self.running else 0,
+                "memo_scrub_progress_blocks": self.current["next_block"],
+                "memo_scrub_files_checked": self.current["files_checked"],
+                "memo_scrub_bytes_hashed": self.current["bytes_hashed"],
+                "memo_scrub_last_files_checked": last.get("files_checked", 0),
+                "memo_scrub_last_missing_files": len(last.get("missing", [])),
+                "memo_scrub_last_mismatched_files": len(last.get("mismatched", [])),
+                "memo_scrub_last_unreadable_files": len(last.get("unreadable", [])),
+                "memo_scrub_last_orphaned_files": len(last.get("orphaned", [])),
+                "memo_scrub_last_completed_timestamp_seconds": (
+                    datetime.fromisoformat(completed_at).timestamp() if completed_at else 0
+                ),
+            }
+
+    # --------------- Persistence ---------------
+
+    def _save_checkpoint(self):
+        """Persist the pass offset and counters; findings are kept in the JSONL file"""
+        if not self.storage_path:
+            return
+        with self._lock:
+            data = {k: v for k, v in self.current.items() if k not in FINDING_KINDS}
+        self._write_json(self.storage_path, data)
+
+    def _save_report(self):
+        """Persist the last completed pass in full (once per pass)"""
+        if not self.report_path:
+            return
+        with self._lock:
+            data = self.last_completed
+        self._write_json(self.report_path, data)
+
+    def _append_findings(self, findings: List[Dict[str, Any]]):
+        if not self.findings_path or not findings:
+            return
+        os.makedirs(os.path.dirname(self.findings_path) or ".", exist_ok=True)
+        with open(self.findings_path, "a", encoding="utf-8") as f:
+            for finding in findings:
+                f.write(json.dumps(finding, ensure_ascii=False) + "\n")
+
+    def _clear_findings(self):
+        if self.findings_path and os.path.exists(self.findings_path):
+            os.remove(self.findings_path)
+
+    @staticmethod
+    def _write_json(path: str, data: Any):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load(self):
+        try:
+            with open(self.storage_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.current = {**self._new_pass(), **data}
+            if self.findings_path and os.path.exists(self.findings_path):
+                with open(self.findings_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        finding = json.loads(line)
+                        # Findings past the checkpoint belong to a batch that will be re-scanned
+                        if finding["block_index"] >= self.current["next_block"]:
+                            continue
+                        self.current[finding.pop("result")].append(finding)
+            if self.report_path and os.path.exists(self.report_path):
+                with open(self.report_path, "r", encoding="utf-8") as f:
+                    self.last_completed = json.load(f)
+        except Exception:
+            # Start a fresh pass if the checkpoint is unreadable
+            self.current = self._new_pass()
+            self.last_completed = None
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from blockchain import Blockchain  # noqa: E402
+from scrubber import IntegrityScrubber, RateLimiter  # noqa: E402
+
+
+class Crash(Exception):
+    pass
+
+
+def add_memo(blockchain, uploads, body, write=True, stored_filename=None):
+    file_hash = hashlib.sha256(body).hexdigest()
+    stored_filename = stored_filename or f"{file_hash}.pdf"
+    if write:
+        (uploads / stored_filename).write_bytes(body)
+    return blockchain.add_transaction({"hash": file_hash, "stored_filename": stored_filename})
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    path = tmp_path / "uploads"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "data" / "scrub_state.json")
+
+
+def make_scrubber(blockchain, uploads, state_path, **kwargs):
+    kwargs.setdefault("batch_size", 2)
+    return IntegrityScrubber(blockchain, str(uploads), storage_path=state_path, **kwargs)
+
+
+def missing_chain(count):
+    """A chain whose memos have no files on disk, so every block yields a finding"""
+    blockchain = Blockchain(storage_path=None)
+    for i in range(count):
+        blockchain.add_transaction({"hash": f"{i:064x}", "stored_filename": f"{i}.pdf"})
+    return blockchain
+
+
+def test_reports_missing_mismatched_and_unreadable(uploads, state_path):
+    blockchain = Blockchain(storage_path=None)
+    add_memo(blockchain, uploads, b"intact")
+    missing = add_memo(blockchain, uploads, b"deleted", write=False)
+    mismatched = add_memo(blockchain, uploads, b"original")
+    (uploads / blockchain.chain[mismatched].transactions[0]["stored_filename"]).write_bytes(b"tampered")
+    unreadable = add_memo(blockchain, uploads, b"dir", write=False)
+    (uploads / blockchain.chain[unreadable].transactions[0]["stored_filename"]).mkdir()
+    unrecorded = blockchain.add_transaction({"hash": "f" * 64})
+
+    scrubber = make_scrubber(blockchain, uploads, state_path)
+    scrubber.run_pass()
+
+    report = scrubber.last_completed
+    assert [f["block_index"] for f in report["missing"]] == [missing, unrecorded]
+    assert [f["block_index"] for f in report["mismatched"]] == [mismatched]
+    assert report["mismatched"][0]["actual_hash"] == hashlib.sha256(b"tampered").hexdigest()
+    assert [f["block_index"] for f in report["unreadable"]] == [unreadable]
+    assert report["files_checked"] == 2
+    metrics = scrubber.metrics()
+    assert metrics["memo_scrub_last_missing_files"] == 2
+    assert metrics["memo_scrub_last_mismatched_files"] == 1
+    assert metrics["memo_scrub_last_unreadable_files"] == 1
+
+
+def test_orphans_skip_files_written_during_pass(uploads, state_path):
+    blockchain = Blockchain(storage_path=None)
+    add_memo(blockchain, uploads, b"referenced")
+    old = uploads / "stray.pdf"
+    old.write_bytes(b"old")
+    os.utime(old, (0, 0))
+    # A file whose block is not appended yet: written after the pass started
+    fresh = uploads / "in-flight.pdf"
+    fresh.write_bytes(b"new")
+    future = time.time() + 60
+    os.utime(fresh, (future, future))
+    (uploads / ".sessions").mkdir()
+
+    scrubber = make_scrubber(blockchain, uploads, state_path)
+    scrubber.run_pass()
+
+    assert scrubber.last_completed["orphaned"] == [{"stored_filename": "stray.pdf", "size": 3}]
+
+
+def test_resume_keeps_checkpointed_findings_and_drops_later_ones(uploads, state_path):
+    blockchain = missing_chain(10)
+
+    class StopAfterTwoBatches(IntegrityScrubber):
+        batches = 0
+
+        def _save_checkpoint(self):
+            super()._save_checkpoint()
+            StopAfterTwoBatches.batches += 1
+            if StopAfterTwoBatches.batches == 2:
+                self._stop.set()
+
+    first = StopAfterTwoBatches(blockchain, str(uploads), storage_path=state_path, batch_size=2)
+    first.run_pass()
+    assert first.current["next_block"] == 4
+    assert first.last_completed is None
+
+    # A batch whose findings were appended but whose checkpoint was never written
+    with open(first.findings_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"block_index": 4, "hash": "x", "stored_filename": "4.pdf", "result": "missing"}) + "\n")
+
+    resumed = make_scrubber(blockchain, uploads, state_path)
+    assert resumed.current["next_block"] == 4
+    assert [f["block_index"] for f in resumed.current["missing"]] == [1, 2, 3]
+
+    resumed.run_pass()
+    assert [f["block_index"] for f in resumed.last_completed["missing"]] == list(range(1, 11))
+    assert not os.path.exists(resumed.findings_path)
+
+
+def test_crash_after_report_before_checkpoint(uploads, state_path, monkeypatch):
+    blockchain = missing_chain(4)
+    scrubber = make_scrubber(blockchain, uploads, state_path)
+    original = IntegrityScrubber._save_checkpoint
+
+    def crash_on_final_checkpoint(self):
+        if self.current["next_block"] == 0 and self.last_completed:
+            raise Crash()
+        original(self)
+
+    monkeypatch.setattr(IntegrityScrubber, "_save_checkpoint", crash_on_final_checkpoint)
+    with pytest.raises(Crash):
+        scrubber.run_pass()
+    monkeypatch.undo()
+
+    # The checkpoint still says "end of chain"; resuming completes without rescanning or duplicating
+    resumed = make_scrubber(blockchain, uploads, state_path)
+    assert resumed.current["next_block"] == len(blockchain.chain)
+    assert len(resumed.last_completed["missing"]) == 4
+    resumed.run_pass()
+    assert [f["block_index"] for f in resumed.last_completed["missing"]] == [1, 2, 3, 4]
+    assert resumed.current["next_block"] == 0
+
+
+def test_crash_after_checkpoint_before_clearing_findings(uploads, state_path, monkeypatch):
+    blockchain = missing_chain(4)
+    scrubber = make_scrubber(blockchain, uploads, state_path)
+
+    def crash(self):
+        raise Crash()
+
+    monkeypatch.setattr(IntegrityScrubber, "_clear_findings", crash)
+    with pytest.raises(Crash):
+        scrubber.run_pass()
+    monkeypatch.undo()
+    assert os.path.exists(scrubber.findings_path)
+
+    # Stale findings from the finished pass must not leak into the next one
+    resumed = make_scrubber(blockchain, uploads, state_path)
+    assert resumed.current["next_block"] == 0
+    assert resumed.current["missing"] == []
+    assert len(resumed.last_completed["missing"]) == 4
+    resumed.run_pass()
+    assert len(resumed.last_completed["missing"]) == 4
+
+
+def test_initial_delay_honours_interval_across_restarts(uploads, state_path):
+    blockchain = missing_chain(2)
+    scrubber = make_scrubber(blockchain, uploads, state_path, interval_seconds=3600)
+    assert scrubber._initial_delay() == 0.0
+
+    scrubber.run_pass()
+    restarted = make_scrubber(blockchain, uploads, state_path, interval_seconds=3600)
+    assert 3500 < restarted._initial_delay() <= 3600
+
+    restarted.last_completed["completed_at"] = (datetime.now() - timedelta(hours=2)).isoformat()
+    assert restarted._initial_delay() == 0.0
+
+    # A pass interrupted mid-way resumes immediately
+    restarted.current["next_block"] = 1
+    restarted.last_completed["completed_at"] = datetime.now().isoformat()
+    assert restarted._initial_delay() == 0.0
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_rate_limiter_disabled(rate):
+    limiter = RateLimiter(rate)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.consume(1024 * 1024 * 1024)
+    assert time.monotonic() - start < 0.1
+
+
+def test_rate_limiter_throttles():
+    limiter = RateLimiter(10_000)
+    start = time.monotonic()
+    limiter.consume(10_000)  # the initial burst allowance
+    limiter.consume(2_000)
+    assert time.monotonic() - start >= 0.15
@@ -0,0 +1,181 @@
+import hashlib
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CHUNK = 64 * 1024
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    """Import the app inside a throwaway cwd; it resolves data/ and uploads/ relatively."""
+    workdir = tmp_path_factory.mktemp("memo-app")
+    original_cwd = os.getcwd()
+    os.chdir(workdir)
+    sys.path.insert(0, str(BACKEND_DIR))
+    original_scrub = os.environ.get("SCRUB_ENABLED")
+    os.environ["SCRUB_ENABLED"] = "0"
+    try:
+        sys.modules.pop("app", None)
+        yield importlib.import_module("app")
+    finally:
+        sys.modules.pop("app", None)
+        sys.path.remove(str(BACKEND_DIR))
+        os.chdir(original_cwd)
+        if original_scrub is None:
+            os.environ.pop("SCRUB_ENABLED", None)
+        else:
+            os.environ["SCRUB_ENABLED"] = original_scrub
+
+
+@pytest.fixture(scope="module")
+def client(app_module):
+    return TestClient(app_module.app)
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    client.post("/auth/register", data={"username": "tester", "password": "pw"})
+    token = client.post("/auth/login", data={"username": "tester", "password": "pw"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def open_session(client, headers, body, declared_hash=None):
+    resp = client.post("/upload_sessions", headers=headers, data={
+        "hash": declared_hash or hashlib.sha256(body).hexdigest(),
+        "size": len(body),
+        "filename": "memo.pdf",
+        "content_type": "application/pdf",
+        "student_id": "42",
+        "student_name": "Test Student",
+        "college": "Engineering",
+    })
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def put_chunk(client, headers, session_id, offset, data):
+    return client.put(
+        f"/upload_sessions/{session_id}",
+        headers=headers,
+        data={"offset": offset},
+        files={"chunk": ("chunk", data)},
+    )
+
+
+def test_check_answers_exists_without_body(client, headers):
+    body = os.urandom(CHUNK)
+    digest = hashlib.sha256(body).hexdigest()
+    resp = client.post("/upload_memo/check", headers=headers, data={"hash": digest, "size": len(body)})
+    assert resp.json()["status"] == "unknown"
+
+    session = open_session(client, headers, body)
+    assert put_chunk(client, headers, session["session_id"], 0, body).json()["status"] == "success"
+
+    resp = client.post("/upload_memo/check", headers=headers, data={"hash": digest, "size": len(body)})
+    assert resp.json()["status"] == "exists"
+    assert resp.json()["block_index"] is not None
+
+
+def test_resume_after_restart_rebuilds_hash(app_module, client, headers):
+    body = os.urandom(3 * CHUNK)
+    session = open_session(client, headers, body)
+    sid = session["session_id"]
+    # Staged on the same filesystem as the final memo so the commit is a plain rename
+    assert Path(app_module.upload_sessions.part_path(sid)).parent.parent == Path(app_module.UPLOADS_DIR)
+
+    assert put_chunk(client, headers, sid, 0, body[:CHUNK]).json()["received_bytes"] == CHUNK
+
+    # Simulate a restart: the in-memory running hash is gone
+    app_module.upload_sessions._hashers.clear()
+    resumed = client.get(f"/upload_sessions/{sid}", headers=headers).json()
+    assert resumed["received_bytes"] == CHUNK
+    assert resumed["student_id"] == "42"
+
+    assert put_chunk(client, headers, sid, CHUNK, body[CHUNK:2 * CHUNK]).status_code == 200
+    resp = put_chunk(client, headers, sid, 2 * CHUNK, body[2 * CHUNK:])
+    assert resp.json()["status"] == "success"
+    stored = Path(app_module.UPLOADS_DIR) / resp.json()["filename"]
+    assert stored.read_bytes() == body
+
+
+def test_stale_offset_returns_server_offset(client, headers):
+    body = os.urandom(2 * CHUNK)
+    sid = open_session(client, headers, body)["session_id"]
+    assert put_chunk(client, headers, sid, 0, body[:CHUNK]).status_code == 200
+
+    # A retried chunk whose first attempt already landed
+    resp = put_chunk(client, headers, sid, 0, body[:CHUNK])
+    assert resp.status_code == 409
+    assert resp.json()["received_bytes"] == CHUNK
+
+    assert put_chunk(client, headers, sid, CHUNK, body[CHUNK:]).json()["status"] == "success"
+
+
+def test_retry_after_failed_metadata_save(app_module, client, headers, monkeypatch):
+    body = os.urandom(2 * CHUNK)
+    sid = open_session(client, headers, body)["session_id"]
+    manager = app_module.upload_sessions
+    original_save = manager._save
+    calls = {"n": 0}
+
+    def flaky_save(session):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise OSError("disk full")
+        original_save(session)
+
+    monkeypatch.setattr(manager, "_save", flaky_save)
+    assert put_chunk(client, headers, sid, 0, body[:CHUNK]).status_code == 500
+    assert client.get(f"/upload_sessions/{sid}", headers=headers).json()["received_bytes"] == 0
+
+    # The retry at the same offset must not leave the chunk hashed twice
+    assert put_chunk(client, headers, sid, 0, body[:CHUNK]).json()["received_bytes"] == CHUNK
+    assert put_chunk(client, headers, sid, CHUNK, body[CHUNK:]).json()["status"] == "success"
+
+
+def test_declared_hash_mismatch_discards_session(app_module, client, headers):
+    body = os.urandom(CHUNK)
+    sid = open_session(client, headers, body, declared_hash="0" * 64)["session_id"]
+
+    resp = put_chunk(client, headers, sid, 0, body)
+    assert resp.status_code == 400
+    assert client.get(f"/upload_sessions/{sid}", headers=headers).status_code == 404
+    assert not os.path.exists(app_module.upload_sessions.part_path(sid))
+    assert app_module.blockchain.find_hash("0" * 64) is None
+
+
+def test_finalize_after_lost_last_response(app_module, client, headers):
+    body = os.urandom(CHUNK)
+    session = open_session(client, headers, body)
+    # Every byte landed but the request finalizing it never completed
+    app_module.upload_sessions.append(app_module.upload_sessions.get(session["session_id"]), 0, body)
+
+    resp = put_chunk(client, headers, session["session_id"], len(body), b"")
+    assert resp.json()["status"] == "success"
+    assert app_module.blockchain.find_hash(hashlib.sha256(body).hexdigest()) == resp.json()["block_index"]
+
+
+def test_finalize_after_crash_before_chain_update(app_module, client, headers, monkeypatch):
+    body = os.urandom(CHUNK)
+    digest = hashlib.sha256(body).hexdigest()
+    sid = open_session(client, headers, body)["session_id"]
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("simulated crash")
+
+    # The staged file is moved into uploads/ before record_memo fails
+    monkeypatch.setattr(app_module, "record_memo", crash)
+    assert put_chunk(client, headers, sid, 0, body).status_code == 500
+    monkeypatch.undo()
+    assert app_module.blockchain.find_hash(digest) is None
+
+    resp = put_chunk(client, headers, sid, len(body), b"")
+    assert resp.json()["status"] == "success"
+    assert app_module.blockchain.find_hash(digest) == resp.json()["block_index"]
+    assert client.get(f"/upload_sessions/{sid}", headers=headers).status_code == 404
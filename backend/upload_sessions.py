@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadSessionError(Exception):
+    """Raised for protocol violations; carries the HTTP status the API should return"""
+
+    def __init__(self, status_code: int, detail: str, received_bytes: Optional[int] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.received_bytes = received_bytes
+
+
+class UploadSessionManager:
+    """Resumable chunked upload sessions, persisted so uploads survive restarts.
+
+    Each session is a JSON metadata file plus a `.part` file holding the bytes received
+    so far. A running SHA-256 is kept per session and updated as chunks arrive; after a
+    restart it is rebuilt once from the `.part` file. Chunks must be appended at the
+    current offset, so a client resumes by asking for `received_bytes` and continuing.
+    """
+
+    def __init__(self, storage_dir: str, ttl_seconds: int = 24 * 3600):
+        self.storage_dir = storage_dir
+        self.ttl_seconds = ttl_seconds
+        self._hashers: Dict[str, Any] = {}
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+    def _meta_path(self, session_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{session_id}.json")
+
+    def part_path(self, session_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{session_id}.part")
+
+    def create(self, file_hash: str, size: int, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Open a new session for a file of `size` bytes declared to hash to `file_hash`"""
+        self.prune_expired()
+        session_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        session = {
+            **metadata,
+            "session_id": session_id,
+            "hash": file_hash,
+            "size": size,
+            "received_bytes": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        open(self.part_path(session_id), "wb").close()
+        self._hashers[session_id] = hashlib.sha256()
+        self._save(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load a session, or None if it does not exist"""
+        if not session_id.isalnum():
+            return None
+        try:
+            with open(self._meta_path(session_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def append(self, session: Dict[str, Any], offset: int, data: bytes) -> Dict[str, Any]:
+        """Append a chunk at `offset`, which must equal the bytes received so far"""
+        received = session["received_bytes"]
+        if offset != received:
+            raise UploadSessionError(409, f"Expected chunk at offset {received}", received_bytes=received)
+        if not data:
+            raise UploadSessionError(400, "Empty chunk", received_bytes=received)
+        if received + len(data) > session["size"]:
+            raise UploadSessionError(400, "Chunk exceeds declared size", received_bytes=received)
+
+        # Hash into a copy and keep it only once the metadata is saved, so a failed
+        # append followed by a retry at the same offset cannot hash the chunk twice
+        hasher = self._hasher(session).copy()
+        with open(self.part_path(session["session_id"]), "r+b") as f:
+            # Truncate any tail left by a write that was interrupted before the metadata was saved
+            f.seek(received)
+            f.truncate()
+            f.write(data)
+        hasher.update(data)
+        session = {
+            **session,
+            "received_bytes": received + len(data),
+            "updated_at": datetime.now().isoformat(),
+        }
+        self._save(session)
+        self._hashers[session["session_id"]] = hasher
+        return session
+
+    def digest(self, session: Dict[str, Any]) -> str:
+        """SHA-256 of the bytes received so far"""
+        return self._hasher(session).hexdigest()
+
+    def discard(self, session_id: str):
+        """Remove a session's metadata and partial file"""
+        self._hashers.pop(session_id, None)
+        for path in (self._meta_path(session_id), self.part_path(session_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def prune_expired(self):
+        """Discard sessions that have not received a chunk within the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.storage_dir):
+            if not name.endswith(".json"):
+                continue
+            if os.path.getmtime(os.path.join(self.storage_dir, name)) < cutoff:
+                self.discard(name[: -len(".json")])
+
+    def _hasher(self, session: Dict[str, Any]):
+        session_id = session["session_id"]
+        hasher = self._hashers.get(session_id)
+        if hasher is None:
+            # Rebuild the running hash after a restart from the bytes already on disk
+            hasher = hashlib.sha256()
+            remaining = session["received_bytes"]
+            with open(self.part_path(session_id), "rb") as f:
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+            self._hashers[session_id] = hasher
+        return hasher
+
+    def _save(self, session: Dict[str, Any]):
+        path = self._meta_path(session["session_id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(session, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
@@ -4,9 +4,26 @@ import { useState } from "react"
 import { UploadIcon, FileText, AlertCircle, CheckCircle, Hash } from "lucide-react"
 import { api, getToken } from "../lib/api"
 
+const CHUNK_SIZE = 1024 * 1024
+const MAX_RETRIES = 3
+
+async function sha256Hex(file) {
+  const buf = await file.arrayBuffer()
+  const hashBuffer = await crypto.subtle.digest("SHA-256", buf)
+  const hashArray = Array.from(new Uint8Array(hashBuffer))
+  return hashArray.map((b) => b.toString(16).padStart(2, "0")).join("")
+}
+
+// Remember open sessions per file hash so a reload resumes instead of restarting
+const sessionKey = (hash) => `upload_session:${hash}`
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
 const Upload = () => {
   const [file, setFile] = useState(null)
   const [uploading, setUploading] = useState(false)
+  const [stage, setStage] = useState("")
+  const [progress, setProgress] = useState(0)
   const [result, setResult] = useState(null)
   const [error, setError] = useState("")
   const [studentId, setStudentId] = useState("")
@@ -48,25 +65,117 @@ const Upload = () => {
       return
     }
 
-    const formData = new FormData()
-    formData.append("file", file)
-    formData.append("student_id", studentId.trim())
-    formData.append("student_name", studentName.trim())
-    formData.append("college", college.trim())
+    if (!file.size) {
+      setError("Empty file")
+      return
+    }
 
     try {
       setUploading(true)
       setError("")
+      setProgress(0)
+
+      // Phase 1: ask by hash first so memos already on the chain are never re-sent
+      setStage("Hashing...")
+      const hash = await sha256Hex(file)
+      setStage("Checking...")
+      const check = new FormData()
+      check.append("hash", hash)
+      check.append("size", file.size)
+      const { data: known } = await api.post("/upload_memo/check", check)
+      if (known.status === "exists") {
+        setResult(known)
+        return
+      }
 
-      const { data } = await api.post("/upload_memo", formData, {
-        headers: { "Content-Type": "multipart/form-data" },
-      })
-      setResult(data)
+      // Phase 2: resumable chunked upload
+      const session = await openSession(hash)
+      if (session.status !== "in_progress") {
+        setResult(session)
+        return
+      }
+      setStage("Uploading...")
+      setResult(await sendChunks(hash, session))
     } catch (err) {
       setError(err.response?.data?.detail || "Upload failed")
       console.error("Upload error:", err)
     } finally {
       setUploading(false)
+      setStage("")
+    }
+  }
+
+  const openSession = async (hash) => {
+    const savedId = localStorage.getItem(sessionKey(hash))
+    if (savedId) {
+      let saved = null
+      try {
+        const { data } = await api.get(`/upload_sessions/${savedId}`)
+        saved = data
+      } catch (err) {
+        localStorage.removeItem(sessionKey(hash))
+      }
+      // The server records the student details given when the session was opened;
+      // if they have been corrected since, start over so the chain gets the new ones
+      const sameDetails =
+        saved &&
+        saved.student_id === studentId.trim() &&
+        saved.student_name === studentName.trim() &&
+        saved.college === college.trim()
+      if (sameDetails) return saved
+      if (saved) {
+        await api.delete(`/upload_sessions/${savedId}`).catch(() => {})
+        localStorage.removeItem(sessionKey(hash))
+      }
+    }
+
+    const form = new FormData()
+    form.append("hash", hash)
+    form.append("size", file.size)
+    form.append("filename", file.name)
+    form.append("content_type", file.type)
+    form.append("student_id", studentId.trim())
+    form.append("student_name", studentName.trim())
+    form.append("college", college.trim())
+    const { data } = await api.post("/upload_sessions", form)
+    if (data.session_id) localStorage.setItem(sessionKey(hash), data.session_id)
+    return data
+  }
+
+  const sendChunks = async (hash, session) => {
+    let offset = session.received_bytes
+    let retries = 0
+    setProgress(Math.round((offset / file.size) * 100))
+
+    while (true) {
+      const form = new FormData()
+      form.append("offset", offset)
+      form.append("chunk", file.slice(offset, offset + CHUNK_SIZE), file.name)
+      try {
+        const { data } = await api.put(`/upload_sessions/${session.session_id}`, form)
+        retries = 0
+        if (data.status !== "in_progress") {
+          localStorage.removeItem(sessionKey(hash))
+          setProgress(100)
+          return data
+        }
+        offset = data.received_bytes
+        setProgress(Math.round((offset / file.size) * 100))
+      } catch (err) {
+        const status = err.response?.status
+        // 409 means the server holds a different offset (e.g. a retried chunk already landed)
+        if (status === 409 && err.response.data?.received_bytes != null) {
+          offset = err.response.data.received_bytes
+          continue
+        }
+        if ((status && status < 500) || ++retries > MAX_RETRIES) {
+          if (status && status < 500) localStorage.removeItem(sessionKey(hash))
+          throw err
+        }
+        await sleep(1000 * retries)
+        const { data } = await api.get(`/upload_sessions/${session.session_id}`)
+        offset = data.received_bytes
+      }
     }
   }
 
@@ -154,7 +263,10 @@ const Upload = () => {
               {uploading ? (
                 <>
                   <div className="animate-spin rounded-full h-4 w-4 border-b-2 border-white"></div>
-                  <span>Uploading...</span>
+                  <span>
+                    {stage || "Uploading..."}
+                    {stage === "Uploading..." && ` ${progress}%`}
+                  </span>
                 </>
               ) : (
                 <>